@@ -1,64 +1,117 @@
 import os
 import csv
-import time
-import requests
+import asyncio
 import sqlite3
-import re
-from bs4 import BeautifulSoup
+import httpx
+from lxml import etree
 from urllib.parse import urljoin
-from datetime import datetime
+
+# XPath expressions evaluated on every press release item, compiled once
+_XP_DATE = etree.XPath(
+    './/span[contains(concat(" ", normalize-space(@class), " "), " views-field-field-data-comunicato ")]'
+    '//time/@datetime'
+)
+_XP_LINK = etree.XPath(
+    './/span[contains(concat(" ", normalize-space(@class), " "), " views-field-field-titolo ")]'
+    '//a[@href]'
+)
+_XP_TEXT = etree.XPath('string()')
+
+def _has_class(elem, class_name):
+    """
+    Check whether an element has class_name among its classes.
+    """
+    return class_name in (elem.get('class') or '').split()
+
+def iter_press_release_items(html_content, chunk_size=8192):
+    """
+    Stream the press release list items of a page.
+    
+    Parsing stops as soon as the first view-content div is closed, so the
+    rest of the page (footer, sidebars, ...) is never parsed. Each item is
+    cleared, together with the items before it, once the caller moves on to
+    the next one.
+    
+    Args:
+        html_content (bytes): Raw HTML content of the page
+        chunk_size (int): Number of bytes fed to the parser at a time
+        
+    Yields:
+        lxml.etree._Element: The views-row list items inside the first view-content div
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'), tag=('div', 'li'))
+    view_content = None
+    offset = 0
+    
+    while True:
+        chunk = html_content[offset:offset + chunk_size]
+        offset += chunk_size
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+        
+        for event, elem in parser.read_events():
+            if event == 'start':
+                # Only the first view-content div holds the press releases,
+                # later ones are other blocks (e.g. sidebars)
+                if view_content is None and elem.tag == 'div' and _has_class(elem, 'view-content'):
+                    view_content = elem
+            elif elem is view_content:
+                # All the press releases have been read
+                return
+            elif elem.tag == 'li' and view_content is not None and _has_class(elem, 'views-row') and any(
+                ancestor is view_content for ancestor in elem.iterancestors('div')
+            ):
+                yield elem
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        
+        if not chunk:
+            break
 
 def extract_communication_data(html_content, base_url):
     """
-    Extract communication urls, titles, and dates from HTML content using BeautifulSoup.
+    Extract communication urls, titles, and dates from HTML content using a streaming lxml parser.
     
     Args:
-        html_content (str): HTML content of the page
+        html_content (bytes): Raw HTML content of the page
         base_url (str): Base URL for creating absolute URLs
         
     Returns:
         list: List of dictionaries containing url, title, and date
     """
-    # Parse the HTML with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
     # Find all list items in the view content
     communications = []
     
-    # Find the view-content div that contains the list of press releases
-    view_content = soup.find('div', class_='view-content')
-    if view_content:
-        # Find all list items that represent press releases
-        items = view_content.find_all('li', class_='views-row')
+    # Stream the list items representing press releases inside the view-content div
+    items = iter_press_release_items(html_content)
+    
+    for item in items:
+        # Extract date
+        dates = _XP_DATE(item)
+        date_text = dates[0] if dates else ''
         
-        for item in items:
-            # Extract date
-            date_elem = item.find('span', class_='views-field-field-data-comunicato')
-            date_text = date_elem.find('time')['datetime'] if date_elem and date_elem.find('time') else ''
-            
-            # Format date if it exists
-            if date_text:
-                try:
-                    date_obj = datetime.strptime(date_text, '%Y-%m-%dT%H:%M:%SZ')
-                    date_formatted = date_obj.strftime('%Y-%m-%d')
-                except ValueError:
-                    date_formatted = date_text
-            else:
-                date_formatted = ''
+        # Format date if it exists, keeping the YYYY-MM-DD prefix of the ISO timestamp
+        if len(date_text) >= 10 and date_text[4] == '-' and date_text[7] == '-':
+            date_formatted = date_text[:10]
+        else:
+            date_formatted = date_text
+        
+        # Extract title and url
+        links = _XP_LINK(item)
+        if links:
+            url_elem = links[0]
+            relative_url = url_elem.get('href')
+            absolute_url = urljoin(base_url, relative_url)
+            title = _XP_TEXT(url_elem).strip()
             
-            # Extract title and url
-            title_elem = item.find('span', class_='views-field-field-titolo')
-            if title_elem and title_elem.find('a'):
-                url_elem = title_elem.find('a')
-                relative_url = url_elem['href']
-                absolute_url = urljoin(base_url, relative_url)
-                title = url_elem.text.strip()
-                
-                communications.append({
-                    'url': absolute_url,
-                    'title': title,
-                    'date': date_formatted
-                })
+            communications.append({
+                'url': absolute_url,
+                'title': title,
+                'date': date_formatted
+            })
     
     return communications
 
@@ -72,10 +125,36 @@ def extract_comunicato_id(url):
     Returns:
         int or None: The extracted ID as an integer, or None if not found
     """
-    match = re.search(r'/comunicato/(\d+)', url)
-    if match:
-        return int(match.group(1))
-    return None
+    _, sep, tail = url.partition('/comunicato/')
+    if not sep:
+        return None
+    
+    # Take the leading run of digits, the ID may be followed by '/', '?', '#', '-', ...
+    end = 0
+    while end < len(tail) and tail[end].isdecimal():
+        end += 1
+    return int(tail[:end]) if end else None
+
+def connect_database(db_file='press_releases.db'):
+    """
+    Open a SQLite connection tuned for bulk writes.
+    
+    Args:
+        db_file (str): Path to the SQLite database file
+    
+    Returns:
+        sqlite3.Connection: The open connection
+    """
+    conn = sqlite3.connect(db_file)
+    
+    # WAL with NORMAL syncing only fsyncs at checkpoints instead of on every commit
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+    conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    
+    return conn
 
 def initialize_database(db_file='press_releases.db'):
     """
@@ -92,7 +171,7 @@ def initialize_database(db_file='press_releases.db'):
         os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
         
         # Connect to SQLite database
-        conn = sqlite3.connect(db_file)
+        conn = connect_database(db_file)
         cursor = conn.cursor()
         
         # Create table if it doesn't exist
@@ -116,7 +195,7 @@ def initialize_database(db_file='press_releases.db'):
         print(f"Error initializing database: {str(e)}")
         return False
 
-def save_page_to_sqlite(data, conn=None, db_file='press_releases.db'):
+def save_page_to_sqlite(data, conn=None, db_file='press_releases.db', commit=True):
     """
     Save a single page of communication data to a SQLite database.
     
@@ -124,6 +203,7 @@ def save_page_to_sqlite(data, conn=None, db_file='press_releases.db'):
         data (list): List of dictionaries containing url, title, and date
         conn (sqlite3.Connection, optional): Existing database connection
         db_file (str): Path to the SQLite database file (used only if conn is None)
+        commit (bool): Whether to commit right away, a new connection is always committed
     
     Returns:
         int: Number of records successfully saved
@@ -135,24 +215,26 @@ def save_page_to_sqlite(data, conn=None, db_file='press_releases.db'):
     try:
         # Use provided connection or create a new one
         if conn is None:
-            conn = sqlite3.connect(db_file)
+            conn = connect_database(db_file)
             close_conn = True
         
         cursor = conn.cursor()
         
-        # Insert data
-        saved_count = 0
-        for item in data:
-            comunicato_id = extract_comunicato_id(item['url'])
-            if comunicato_id:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO press_releases (id, url, title, date, content) VALUES (?, ?, ?, ?, ?)",
-                    (comunicato_id, item['url'], item['title'], item['date'], None)
-                )
-                saved_count += 1
+        # Insert data, skipping urls without a comunicato ID
+        rows = [
+            (comunicato_id, item['url'], item['title'], item['date'], None)
+            for item in data
+            if (comunicato_id := extract_comunicato_id(item['url']))
+        ]
+        cursor.executemany(
+            "INSERT OR IGNORE INTO press_releases (id, url, title, date, content) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        saved_count = len(rows)
         
         # Commit changes
-        conn.commit()
+        if commit or close_conn:
+            conn.commit()
         
         # Close connection only if we created it
         if close_conn:
@@ -169,60 +251,121 @@ def save_page_to_sqlite(data, conn=None, db_file='press_releases.db'):
                 pass
         return 0
 
-def scrape_and_save_pages(start_page=0, end_page=7226, base_url='https://press.comune.fi.it', db_file='press_releases.db'):
+async def scrape_page(client, semaphore, queue, page_num, end_page, base_url):
     """
-    Scrape all pages from start_page to end_page and save each page immediately to the database.
+    Scrape a single page and queue its communication data for saving.
+    
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client
+        semaphore (asyncio.Semaphore): Semaphore bounding the concurrent requests
+        queue (asyncio.Queue): Queue consumed by write_pages
+        page_num (int): Page number
+        end_page (int): Ending page number, used for logging
+        base_url (str): Base URL of the website
+    """
+    url = f"{base_url}/?page={page_num}"
+    
+    try:
+        async with semaphore:
+            print(f"Scraping page {page_num} of {end_page}...")
+            response = await client.get(url)
+        
+        if response.status_code == 200:
+            # Parse in a worker thread so the event loop keeps fetching
+            page_data = await asyncio.to_thread(extract_communication_data, response.content, base_url)
+            print(f"Found {len(page_data)} press releases on page {page_num}")
+            await queue.put((page_num, page_data))
+        else:
+            print(f"Failed to retrieve page {page_num}. Status code: {response.status_code}")
+            
+    except Exception as e:
+        print(f"Error processing page {page_num}: {str(e)}")
+        # Continue with the next page
+
+async def write_pages(conn, queue, commit_every=20, collected_pages=None):
+    """
+    Save the queued pages to the database until a None sentinel is received.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection, only used by this task
+        queue (asyncio.Queue): Queue of (page_num, page_data) tuples
+        commit_every (int): Number of saved pages between two commits
+        collected_pages (list, optional): List the saved (page_num, page_data) tuples are appended to
+        
+    Returns:
+        int: Total number of records saved
+    """
+    total_saved = 0
+    pending_pages = 0
+    
+    while (page := await queue.get()) is not None:
+        page_num, page_data = page
+        saved_count = save_page_to_sqlite(page_data, conn=conn, commit=False)
+        total_saved += saved_count
+        print(f"Saved {saved_count} press releases from page {page_num} to database")
+        if collected_pages is not None:
+            collected_pages.append(page)
+        
+        # Commit every commit_every pages rather than after each one
+        pending_pages += 1
+        if pending_pages >= commit_every:
+            conn.commit()
+            pending_pages = 0
+    
+    conn.commit()
+    return total_saved
+
+async def scrape_and_save_pages(start_page=0, end_page=7226, base_url='https://press.comune.fi.it', db_file='press_releases.db', commit_every=20, concurrency=5, csv_file=None):
+    """
+    Scrape all pages from start_page to end_page concurrently and save them to the database as they come in.
     
     Args:
         start_page (int): Starting page number
         end_page (int): Ending page number
         base_url (str): Base URL of the website
         db_file (str): Path to the SQLite database file
+        commit_every (int): Number of saved pages between two commits
+        concurrency (int): Maximum number of requests in flight, to avoid overwhelming the server
+        csv_file (str, optional): Path of a CSV file to also save the scraped data to
         
     Returns:
         int: Total number of records saved
     """
     total_saved = 0
     
-    # Create a session for better performance
-    session = requests.Session()
-    
     # Create a single database connection to reuse
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect_database(db_file)
         
-        for page_num in range(start_page, end_page + 1):
-            url = f"{base_url}/?page={page_num}"
-            
-            try:
-                print(f"Scraping page {page_num} of {end_page}...")
-                response = session.get(url)
-                
-                if response.status_code == 200:
-                    page_data = extract_communication_data(response.text, base_url)
-                    print(f"Found {len(page_data)} press releases on page {page_num}")
-                    
-                    # Save the current page data using the existing connection
-                    saved_count = save_page_to_sqlite(page_data, conn=conn)
-                    total_saved += saved_count
-                    print(f"Saved {saved_count} press releases from page {page_num} to database")
-                    
-                    # Add a small delay to avoid overwhelming the server
-                    time.sleep(2)
-                else:
-                    print(f"Failed to retrieve page {page_num}. Status code: {response.status_code}")
-                    
-            except Exception as e:
-                print(f"Error processing page {page_num}: {str(e)}")
-                # Continue with the next page
+        # A single writer task saves the pages, so the connection is never shared
+        queue = asyncio.Queue()
+        collected_pages = [] if csv_file else None
+        writer = asyncio.create_task(write_pages(conn, queue, commit_every, collected_pages))
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(http2=True, follow_redirects=True, timeout=30) as client:
+            await asyncio.gather(*(
+                scrape_page(client, semaphore, queue, page_num, end_page, base_url)
+                for page_num in range(start_page, end_page + 1)
+            ))
+        
+        # Tell the writer there are no more pages and wait for it to finish
+        await queue.put(None)
+        total_saved = await writer
+        
+        # Reuse the pages parsed for the database rather than scraping them again
+        if csv_file:
+            collected_pages.sort(key=lambda page: page[0])
+            save_to_csv([item for _, page_data in collected_pages for item in page_data], csv_file)
                 
     except Exception as e:
         print(f"Database connection error: {str(e)}")
     finally:
-        # Ensure the connection is closed properly
+        # Ensure the pending pages are committed and the connection is closed properly
         if conn:
             try:
+                conn.commit()
                 conn.close()
                 print("Database connection closed.")
             except Exception as e:
@@ -247,12 +390,10 @@ def save_to_csv(data, output_file='press_releases.csv'):
     
     # Write data to CSV
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['url', 'title', 'date']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.writer(csvfile)
         
-        writer.writeheader()
-        for item in data:
-            writer.writerow(item)
+        writer.writerow(('url', 'title', 'date'))
+        writer.writerows((item['url'], item['title'], item['date']) for item in data)
     
     print(f"Data saved to {output_file}")
 
@@ -268,10 +409,14 @@ def main():
     start_page = 0
     end_page = 7226
     
+    # To also save the scraped data to a CSV file, set this to its path:
+    # csv_file = os.path.join(os.getcwd(), 'press_releases.csv')
+    csv_file = None
+    
     # Initialize the database first
     if initialize_database(db_file):
         # Scrape pages and save data incrementally
-        total_saved = scrape_and_save_pages(start_page, end_page, db_file=db_file)
+        total_saved = asyncio.run(scrape_and_save_pages(start_page, end_page, db_file=db_file, csv_file=csv_file))
         print(f"\nTotal press releases saved to database: {total_saved}")
         
         # You can uncomment the following lines to immediately extract content after scraping links
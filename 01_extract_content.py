@@ -1,134 +1,204 @@
 import os
-import time
+import asyncio
 import sqlite3
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from lxml import etree, html as lxml_html
 from urllib.parse import urljoin
 
-def extract_page_content(url, max_retries=3, timeout=10):
+# XPath expressions evaluated on every press release page, compiled once
+_XP_VIEW_CONTENT = etree.XPath(
+    '(//div[contains(concat(" ", normalize-space(@class), " "), " view-content ")])[1]'
+)
+_XP_TEXTS = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+
+def parse_page_content(html_content, url):
+    """
+    Parse the content of a press release page.
+    
+    Args:
+        html_content (bytes): Raw HTML content of the page
+        url (str): URL of the page, used for logging
+        
+    Returns:
+        str or None: Extracted content as text, or None if no content was found
+    """
+    # Parse HTML with lxml directly, which releases the GIL while parsing so
+    # pages handed to worker threads are really parsed in parallel
+    try:
+        tree = lxml_html.fromstring(html_content)
+    except etree.ParserError:
+        # e.g. an empty body, fetching the page again won't help
+        print(f"Warning: No view-content div found at {url}")
+        return None
+    
+    # Find the view-content div that contains the press release content
+    view_content = _XP_VIEW_CONTENT(tree)
+    
+    if view_content:
+        # Extract all text content, preserving some structure
+        texts = _XP_TEXTS(view_content[0])
+        return " ".join(text.strip() for text in texts if text.strip())
+    
+    print(f"Warning: No view-content div found at {url}")
+    return None
+
+def create_client(concurrency=8, timeout=10, retries=3):
+    """
+    Create the HTTP client shared by all the content requests.
+    
+    Args:
+        concurrency (int): Maximum number of requests in flight
+        timeout (int): Request timeout in seconds
+        retries (int): Number of retries on connection failures
+        
+    Returns:
+        httpx.AsyncClient: Client with a pooled, retrying HTTP/2 transport
+    """
+    # Connection failures are retried by the transport, on the same pool
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=concurrency + 2, max_keepalive_connections=concurrency + 2),
+        retries=retries,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout, follow_redirects=True)
+
+async def extract_page_content(client, semaphore, url, max_retries=3):
     """
     Extract content from a press release page.
     
     Args:
+        client (httpx.AsyncClient): Shared HTTP client, see create_client
+        semaphore (asyncio.Semaphore): Semaphore bounding the concurrent requests
         url (str): URL of the press release page
-        max_retries (int): Maximum number of retry attempts
-        timeout (int): Request timeout in seconds
+        max_retries (int): Maximum number of attempts on HTTP errors and timeouts
         
     Returns:
         str or None: Extracted content as text, or None if extraction failed
     """
-    session = requests.Session()
     retries = 0
     
     while retries < max_retries:
         try:
-            print(f"Fetching content from: {url}")
-            response = session.get(url, timeout=timeout)
+            async with semaphore:
+                print(f"Fetching content from: {url}")
+                response = await client.get(url)
             
             if response.status_code == 200:
-                # Parse HTML with BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Find the view-content div that contains the press release content
-                view_content = soup.find('div', class_='view-content')
-                
-                if view_content:
-                    # Extract all text content, preserving some structure
-                    content_text = view_content.get_text(" ", strip=True)
-                    return content_text
-                else:
-                    print(f"Warning: No view-content div found at {url}")
-                    return None
+                # Parse in a worker thread so the event loop keeps fetching
+                return await asyncio.to_thread(parse_page_content, response.content, url)
             else:
                 print(f"Failed to retrieve content from {url}. Status code: {response.status_code}")
                 retries += 1
-                time.sleep(0.1)  # Wait before retrying
+                await asyncio.sleep(0.1)  # Wait before retrying
                 
         except Exception as e:
             print(f"Error fetching content from {url}: {str(e)}")
             retries += 1
-            time.sleep(2)  # Wait before retrying
+            await asyncio.sleep(2)  # Wait before retrying
     
     print(f"Failed to retrieve content after {max_retries} attempts from {url}")
     return None
 
-def update_press_release_content(db_file='press_releases.db', limit=None):
+async def _update_press_release_content(read_conn, write_conn, limit=None, batch_size=50, concurrency=8):
     """
-    Update press release content for entries with NULL content.
+    Fetch and store the content of the entries with NULL content, a batch at a time.
     
     Args:
-        db_file (str): Path to the SQLite database file
+        read_conn (sqlite3.Connection): Connection streaming the entries to process
+        write_conn (sqlite3.Connection): Connection the updates are committed on
         limit (int, optional): Maximum number of entries to process
+        batch_size (int): Number of entries fetched concurrently and committed together
+        concurrency (int): Maximum number of requests in flight
         
     Returns:
         int: Number of entries successfully updated
     """
-    try:
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-        
-        batch_size = 5  # Process 5 entries at a time
-        updated_count = 0
-        total_processed = 0
-        
+    # Stream all the entries with NULL content from a single query, instead of
+    # re-selecting the first NULL rows for every batch
+    cursor = read_conn.cursor()
+    cursor.execute("SELECT id, url FROM press_releases WHERE content IS NULL")
+    update_cursor = write_conn.cursor()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    updated_count = 0
+    total_processed = 0
+    
+    async with create_client(concurrency) as client:
         while True:
-            # Get entries with NULL content without using OFFSET
-            # Always get the first batch_size rows where content is NULL
             if limit and total_processed + batch_size > limit:
                 # Adjust batch size for the last batch if we're approaching the limit
                 current_batch_size = limit - total_processed
             else:
                 current_batch_size = batch_size
-                
-            cursor.execute(
-                "SELECT id, url FROM press_releases WHERE content IS NULL LIMIT ?", 
-                (current_batch_size,)
-            )
             
-            entries = cursor.fetchall()
+            entries = cursor.fetchmany(current_batch_size)
             print(f"Processing batch of {len(entries)} entries")
             
             if not entries:
                 break  # No more entries to process
-                
-            for release_id, url in entries:
-                # Extract content
-                content = extract_page_content(url)
-                
+            
+            # Fetch the whole batch concurrently
+            contents = await asyncio.gather(
+                *(extract_page_content(client, semaphore, url) for _, url in entries)
+            )
+            
+            updates = []
+            for (release_id, _), content in zip(entries, contents):
                 if content:
-                    # Update the database
-                    cursor.execute(
-                        "UPDATE press_releases SET content = ? WHERE id = ?",
-                        (content, release_id)
-                    )
-                    conn.commit()
-                    updated_count += 1
+                    updates.append((content, release_id))
                     print(f"Updated content for ID {release_id}")
                 else:
                     print(f"Could not extract content for ID {release_id}")
-                
-                # Small delay to avoid hammering the server
-                time.sleep(.1)
-                
-                total_processed += 1
-                
-                # Break if we've reached the specified limit
-                if limit and total_processed >= limit:
-                    break
+            
+            # Update the database, one transaction per batch
+            update_cursor.executemany(
+                "UPDATE press_releases SET content = ? WHERE id = ?",
+                updates
+            )
+            write_conn.commit()
+            updated_count += len(updates)
+            total_processed += len(entries)
             
             # Break if we've reached the specified limit
             if limit and total_processed >= limit:
                 break
+    
+    print(f"Processed {total_processed} entries in total")
+    return updated_count
+
+def update_press_release_content(db_file='press_releases.db', limit=None):
+    """
+    Update press release content for entries with NULL content.
+    
+    Args:
+        db_file (str): Path to the SQLite database file
+        limit (int, optional): Maximum number of entries to process
+        
+    Returns:
+        int: Number of entries successfully updated
+    """
+    read_conn = write_conn = None
+    try:
+        read_conn = sqlite3.connect(db_file)
+        # WAL lets the write connection commit while the read cursor is still open
+        read_conn.execute("PRAGMA journal_mode=WAL")
+        # Partial index so the NULL content lookup only walks the pending rows
+        read_conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_null_content ON press_releases(id) WHERE content IS NULL"
+        )
+        read_conn.commit()
+        write_conn = sqlite3.connect(db_file)
         
-        print(f"Processed {total_processed} entries in total")
-        conn.close()
+        updated_count = asyncio.run(_update_press_release_content(read_conn, write_conn, limit))
         return updated_count
         
     except Exception as e:
         print(f"Error updating press release content: {str(e)}")
-        if 'conn' in locals() and conn:
-            conn.close()
         return 0
+    finally:
+        for conn in (read_conn, write_conn):
+            if conn:
+                conn.close()
 
 def main():
     # Define database file path
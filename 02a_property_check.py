@@ -1,11 +1,14 @@
 import sqlite3
-import re
 
-def properties_hold(row):
-    
-    starts_with_word_then_space = re.match(r"\w+\s", row[4])
-    has_date_after_starting_word = re.match(r"\d{2}\/\d{2}\/\d{4}", row[4].split()[1])
-    return starts_with_word_then_space and has_date_after_starting_word
+def properties_hold(content, parts):
+    # content must be "<word> dd/mm/yyyy ...", checked on the pre-split tokens
+    if len(parts) < 2 or content[0].isspace():
+        return False
+    if not all(c.isalnum() or c == '_' for c in parts[0]):
+        return False
+    date = parts[1]
+    return (len(date) == 10 and date[2] == '/' and date[5] == '/'
+            and date[:2].isdecimal() and date[3:5].isdecimal() and date[6:].isdecimal())
 
 conn = sqlite3.connect('press_releases_copy.db')
 cursor = conn.cursor()
@@ -14,9 +17,11 @@ cursor.execute('SELECT * FROM press_releases')
 violating_rows = []
 starting_words_set = set()
 for row in cursor:
-    if not properties_hold(row):
+    parts = row[4].split(None, 2)
+    if not properties_hold(row[4], parts):
         violating_rows.append(row)
-    starting_words_set.add(row[4].split()[0])
+    if parts:
+        starting_words_set.add(parts[0])
 
 print(f"there are {len(violating_rows)} rows that violate the property")
 
@@ -2,39 +2,61 @@ import sqlite3
 import re
 import time
 
-def extract_issuer(row, issuers_set) -> (str, str):
-    # returns the issuer and the date of the press release
-    # check if the row starts with a word in a set issuers
+# issuers keyed by the first word of the content, "Notizie di servizio" is the
+# only multi-word one
+ISSUER_BY_FIRST = {
+    "Altro": "Altro",
+    "Consiglio": "Consiglio",
+    "Giunta": "Giunta",
+    "Notizie": "Notizie di servizio",
+    "Quartieri": "Quartieri",
+    "Sindaco": "Sindaco",
+}
 
-    for issuer in issuers_set:
-        if row[4].startswith(issuer):
-            return issuer
-    raise ValueError(f"issuer not found in row {row}")
+def extract_issuer(text: str) -> str:
+    # returns the issuer of the press release, looked up from the first word
+    # of its content
+
+    words = text.split(None, 1)
+    issuer = ISSUER_BY_FIRST.get(words[0]) if words else None
+    # the first word only picks the candidate, e.g. "Notizie flash" is not "Notizie di servizio"
+    if issuer is None or not text.startswith(issuer):
+        raise ValueError(f"issuer not found in content {text!r}")
+    return issuer
+
+def add_issuer_column(cursor):
+    # alter the table to add the issuer column if the column does not exist
+    columns = {column[1] for column in cursor.execute('PRAGMA table_info(press_releases)')}
+    if 'issuer' not in columns:
+        cursor.execute('ALTER TABLE press_releases ADD COLUMN issuer TEXT')
+
+def clean_rows(rows):
+    # yields the (issuer, content, id) update parameters for each row
+    for row in rows:
+        issuer = extract_issuer(row[4])
+        # remove the issuer, the date and their trailing spaces from the content
+        yield issuer, row[4][len(issuer)+12:], row[0]
 
 conn = sqlite3.connect('press_releases_02.db')
 cursor = conn.cursor()
 update_cursor = conn.cursor()
 
-# alter the table to add the issuer column if the column does not exist
-try:
-    cursor.execute('ALTER TABLE press_releases ADD COLUMN issuer TEXT')
-except sqlite3.OperationalError:
-    # the column already exists
-    pass
-
-cursor.execute('SELECT * FROM press_releases')
-
-issuers_set = {"Altro", "Consiglio", "Giunta", "Notizie di servizio", "Quartieri", "Sindaco"}
-for row in cursor:
-    issuer = extract_issuer(row, issuers_set)
-    # remove the issuer and the date from the content, +1 for the space
-    len_issuer = len(issuer)+1
-    len_date = 11
-    total_len = len_issuer + len_date
-    row_content = row[4][total_len:]
-    # print(f"{issuer}: {row_content}")
-    # update the row
-    update_cursor.execute('UPDATE press_releases SET issuer = ? WHERE id = ?', (issuer, row[0]))
-    update_cursor.execute('UPDATE press_releases SET content = ? WHERE id = ?', (row_content, row[0]))
-
-conn.commit()
\ No newline at end of file
+# WAL + relaxed syncing, the whole rewrite is committed once at the end
+conn.execute('PRAGMA journal_mode=WAL')
+conn.execute('PRAGMA synchronous=NORMAL')
+# no per-row constraint checks while rewriting the rows
+conn.execute('PRAGMA foreign_keys=OFF')
+
+add_issuer_column(cursor)
+
+# read the rows from a second connection, so that the update transaction
+# doesn't interfere with the select cursor (WAL lets them run side by side)
+read_conn = sqlite3.connect('press_releases_02.db')
+read_cursor = read_conn.execute('SELECT * FROM press_releases')
+
+# update all the rows in one go, streaming them from the select cursor
+conn.execute('BEGIN IMMEDIATE')
+update_cursor.executemany('UPDATE press_releases SET issuer = ?, content = ? WHERE id = ?', clean_rows(read_cursor))
+
+conn.commit()
+read_conn.close()
\ No newline at end of file